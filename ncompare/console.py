@@ -78,6 +78,13 @@ def _cli(args) -> argparse.Namespace:
         help="Include chunk sizes in the table that compares variables",
     )
 
+    parser.add_argument(
+        "--fast-fail",
+        action="store_true",
+        default=False,
+        help="Stop at the first structural difference and exit with an error",
+    )
+
     parser.add_argument(
         "--column-widths",
         nargs=3,
@@ -28,25 +28,49 @@
 # pylint: disable=fixme
 
 """Compare the structure of two NetCDF files."""
-import random
-import traceback
+import math
 from collections import namedtuple
-from collections.abc import Iterable
+from collections.abc import Collection, Iterable
+from contextlib import ExitStack
+from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
 from typing import Optional, Union
 
 import netCDF4
 import numpy as np
-import xarray as xr
 from colorama import Fore, Style
 
+try:
+    import h5py
+except ImportError:  # h5py is optional, and is only used to memory-map contiguous variables.
+    h5py = None
+
 from ncompare.printing import Outputter
 from ncompare.sequence_operations import common_elements, count_diffs
 from ncompare.utils import ensure_valid_path_exists, ensure_valid_path_with_suffix
 
+# Variables with any of these attributes are not read raw via memory-mapping,
+#   because netCDF4 would otherwise decode their values.
+_DECODING_ATTRIBUTES = (
+    "scale_factor",
+    "add_offset",
+    "valid_min",
+    "valid_max",
+    "valid_range",
+    "_Unsigned",
+)
+
+# Random number generator used for selecting sample points to compare.
+_rng = np.random.default_rng()
+
 VarProperties = namedtuple("VarProperties", "varname, variable, dtype, shape, chunking, attributes")
 
 
+class StructureMismatch(Exception):
+    """Raised when fast-fail is enabled and the structure of the two files differs."""
+
+
 def compare(
     nc_a: Union[str, Path],
     nc_b: Union[str, Path],
@@ -60,6 +84,7 @@ def compare(
     file_csv: Union[str, Path] = "",
     file_xlsx: Union[str, Path] = "",
     column_widths: Optional[tuple[Union[int, str], Union[int, str], Union[int, str]]] = None,
+    fast_fail: bool = False,
 ) -> None:
     """Compare the variables contained within two different NetCDF datasets.
 
@@ -89,10 +114,18 @@ def compare(
         filepath destination to save comparison output as an Excel workbook.
     column_widths : tuple[int | str, int | str, int | str], optional
         the width in number of characters for each column of the comparison table.
+    fast_fail : bool, default False
+        Whether to stop at the first structural difference (in dimensions, groups, or variables)
+        instead of walking through the rest of the files.
 
     Returns
     -------
     None
+
+    Raises
+    ------
+    StructureMismatch
+        If `fast_fail` is set and the structure of the two files differs.
     """
     # Check the validity of paths.
     nc_a = ensure_valid_path_exists(nc_a)
@@ -111,6 +144,7 @@ def compare(
         no_color=no_color,
         text_file=file_text,
         column_widths=column_widths,
+        buffer_stdout=True,
     ) as out:
         out.print(f"File A: {nc_a}")
         out.print(f"File B: {nc_b}")
@@ -124,6 +158,7 @@ def compare(
             comparison_var_name=comparison_var_name,
             show_chunks=show_chunks,
             show_attributes=show_attributes,
+            fast_fail=fast_fail,
         )
 
         # Write to CSV and Excel files.
@@ -143,6 +178,7 @@ def run_through_comparisons(
     comparison_var_name: Optional[str],
     show_chunks: bool,
     show_attributes: bool,
+    fast_fail: bool = False,
 ) -> None:
     """Execute a series of comparisons between two NetCDF files.
 
@@ -155,94 +191,131 @@ def run_through_comparisons(
     comparison_var_name
     show_chunks
     show_attributes
+    fast_fail
     """
-    # Show the dimensions of each file and evaluate differences.
-    out.print(Fore.LIGHTBLUE_EX + "\nRoot-level Dimensions:", add_to_history=True)
-    list_a = _get_dims(nc_a)
-    list_b = _get_dims(nc_b)
-    _, _, _ = out.lists_diff(list_a, list_b)
-
-    # Show the groups in each NetCDF file and evaluate differences.
-    out.print(Fore.LIGHTBLUE_EX + "\nRoot-level Groups:", add_to_history=True)
-    list_a = _get_groups(nc_a)
-    list_b = _get_groups(nc_b)
-    _, _, _ = out.lists_diff(list_a, list_b)
-
-    if comparison_var_group:
-        # Show the variables within the selected group.
-        out.print(
-            Fore.LIGHTBLUE_EX + f"\nVariables within specified group <{comparison_var_group}>:",
-            add_to_history=True,
-        )
-        vlist_a = _get_vars(nc_a, comparison_var_group)
-        vlist_b = _get_vars(nc_b, comparison_var_group)
-        _, _, _ = out.lists_diff(vlist_a, vlist_b)
-
-        # TODO: Remove comparison variable/val?
-        if comparison_var_name:
-            try:
-                # Print the first part of the values array for the selected variable.
-                out.print(
-                    Fore.LIGHTBLUE_EX
-                    + f"\nSample values within specified variable <{comparison_var_name}>:"
-                )
-                _print_sample_values(out, nc_a, comparison_var_group, comparison_var_name)
-                _print_sample_values(out, nc_b, comparison_var_group, comparison_var_name)
-                # compare_sample_values(nc_a, nc_b, groupname=comparison_var_group, varname=comparison_var_name)
-
-                out.print(
-                    Fore.LIGHTBLUE_EX
-                    + f"\nChecking multiple random values within specified variable <{comparison_var_name}>:"
-                )
-                compare_multiple_random_values(
-                    out, nc_a, nc_b, groupname=comparison_var_group, varname=comparison_var_name
-                )
-
-            except KeyError:
-                out.print(
-                    Style.BRIGHT
-                    + Fore.RED
-                    + f"\nError when comparing values for variable <{comparison_var_name}> "
-                    f"in group <{comparison_var_group}>."
-                )
-                out.print(traceback.format_exc())
-                out.print("\n")
+    # Each file is opened only once, and the open handles are shared by all the helpers below.
+    #   If both paths point to the same file, then a single handle is used for both.
+    #   Note: the reads from the two files are deliberately not run concurrently in threads.
+    #   The underlying netcdf-c library is not thread-safe (see the netCDF4-python documentation),
+    #   and once the files are open, the dimension, group, and variable listings are in-memory lookups.
+    with ExitStack() as stack:
+        ds_a = stack.enter_context(netCDF4.Dataset(nc_a))
+        if Path(nc_a).samefile(nc_b):
+            ds_b = ds_a
         else:
-            out.print(Fore.LIGHTBLACK_EX + "\nNo variable selected for comparison. Skipping..")
-    else:
-        out.print(Fore.LIGHTBLACK_EX + "\nNo variable group selected for comparison. Skipping..")
+            ds_b = stack.enter_context(netCDF4.Dataset(nc_b))
+
+        # Show the dimensions of each file and evaluate differences.
+        out.print(Fore.LIGHTBLUE_EX + "\nRoot-level Dimensions:", add_to_history=True)
+        list_a = _get_dims(ds_a)
+        list_b = _get_dims(ds_b)
+        left, right, _ = out.lists_diff(list_a, list_b)
+        _check_fast_fail(fast_fail, left, right, "Root-level dimensions")
+
+        # Show the groups in each NetCDF file and evaluate differences.
+        out.print(Fore.LIGHTBLUE_EX + "\nRoot-level Groups:", add_to_history=True)
+        list_a = _get_groups(ds_a)
+        list_b = _get_groups(ds_b)
+        left, right, _ = out.lists_diff(list_a, list_b)
+        _check_fast_fail(fast_fail, left, right, "Root-level groups")
+        out.flush()
+
+        if comparison_var_group:
+            # Show the variables within the selected group.
+            out.print(
+                Fore.LIGHTBLUE_EX + f"\nVariables within specified group <{comparison_var_group}>:",
+                add_to_history=True,
+            )
+            # The header is flushed first, because _get_vars prints directly to stdout if the group is missing.
+            out.flush()
+            vlist_a = _get_vars(ds_a, comparison_var_group)
+            vlist_b = _get_vars(ds_b, comparison_var_group)
+            left, right, _ = out.lists_diff(vlist_a, vlist_b)
+            _check_fast_fail(
+                fast_fail, left, right, f"Variables within group <{comparison_var_group}>"
+            )
 
-    out.print(Fore.LIGHTBLUE_EX + "\nAll variables:", add_to_history=True)
-    _, _, _ = compare_two_nc_files(
-        out, nc_a, nc_b, show_chunks=show_chunks, show_attributes=show_attributes
-    )
+            # TODO: Remove comparison variable/val?
+            if comparison_var_name:
+                # Check up-front that the variable exists in both files.
+                files_missing_var = [
+                    label
+                    for label, dataset in (("A", ds_a), ("B", ds_b))
+                    if comparison_var_name
+                    not in _get_group(dataset, comparison_var_group).variables
+                ]
+                if files_missing_var:
+                    out.print(
+                        Style.BRIGHT
+                        + Fore.RED
+                        + f"\nError when comparing values for variable <{comparison_var_name}> "
+                        f"in group <{comparison_var_group}>: "
+                        f"variable not found in File {' and File '.join(files_missing_var)}."
+                    )
+                    out.print("\n")
+                else:
+                    # Print the first part of the values array for the selected variable.
+                    out.print(
+                        Fore.LIGHTBLUE_EX
+                        + f"\nSample values within specified variable <{comparison_var_name}>:"
+                    )
+                    _print_sample_values(out, ds_a, comparison_var_group, comparison_var_name)
+                    _print_sample_values(out, ds_b, comparison_var_group, comparison_var_name)
+                    # compare_sample_values(nc_a, nc_b, groupname=comparison_var_group, varname=comparison_var_name)
+
+                    out.print(
+                        Fore.LIGHTBLUE_EX
+                        + f"\nChecking multiple random values within specified variable <{comparison_var_name}>:"
+                    )
+                    compare_multiple_random_values(
+                        out, ds_a, ds_b, groupname=comparison_var_group, varname=comparison_var_name
+                    )
+
+            else:
+                out.print(Fore.LIGHTBLACK_EX + "\nNo variable selected for comparison. Skipping..")
+        else:
+            out.print(
+                Fore.LIGHTBLACK_EX + "\nNo variable group selected for comparison. Skipping.."
+            )
+
+        out.print(Fore.LIGHTBLUE_EX + "\nAll variables:", add_to_history=True)
+        _, _, _ = compare_two_nc_files(
+            out,
+            ds_a,
+            ds_b,
+            show_chunks=show_chunks,
+            show_attributes=show_attributes,
+            fast_fail=fast_fail,
+        )
+
+
+def _check_fast_fail(fast_fail: bool, left: int, right: int, items_description: str) -> None:
+    """Raise an error if fast-fail is enabled and some items are present in only one of the files."""
+    if fast_fail and (left or right):
+        raise StructureMismatch(
+            f"{items_description} differ between the two files "
+            f"({left} only in File A, {right} only in File B)."
+        )
 
 
 def compare_multiple_random_values(
     out: Outputter,
-    nc_a: Union[str, Path],
-    nc_b: Union[str, Path],
+    nc_a: netCDF4.Dataset,
+    nc_b: netCDF4.Dataset,
     groupname: str,
     varname: str,
     num_comparisons: int = 100,
 ):
     """Iterate through N random samples, and evaluate whether the differences exceed a threshold."""
-    # Open a variable from each NetCDF
-    nc_var_a = xr.open_dataset(nc_a, backend_kwargs={"group": groupname}).variables[varname]
-    nc_var_b = xr.open_dataset(nc_b, backend_kwargs={"group": groupname}).variables[varname]
-
-    num_mismatches = 0
-    for _ in range(num_comparisons):
-        match_result = _match_random_value(out, nc_var_a, nc_var_b)
-        if match_result is True:
-            out.print(".", colors=False, end="")
-        elif match_result is None:
-            out.print("n", colors=False, end="")
-            num_mismatches += 1
-        else:
-            out.print("x", colors=False, end="")
-            num_mismatches += 1
+    # Get a variable from each NetCDF
+    nc_var_a = _get_group(nc_a, groupname).variables[varname]
+    nc_var_b = _get_group(nc_b, groupname).variables[varname]
 
+    exceeded, only_one_is_null = _match_random_values(
+        out, nc_var_a, nc_var_b, num_comparisons=num_comparisons
+    )
+
+    num_mismatches = int(np.count_nonzero(exceeded | only_one_is_null))
     if num_mismatches > 0:
         out.print(Fore.RED + f" {num_mismatches} mismatches, out of {num_comparisons} samples.")
     else:
@@ -305,41 +378,49 @@ def walk_common_groups_tree(  # type:ignore[misc]
 
 def compare_two_nc_files(
     out: Outputter,
-    nc_one: Union[str, Path],
-    nc_two: Union[str, Path],
+    nc_a: netCDF4.Dataset,
+    nc_b: netCDF4.Dataset,
     show_chunks: bool = False,
     show_attributes: bool = False,
+    fast_fail: bool = False,
 ) -> tuple[int, int, int]:
     """Go through all groups and all variables, and show them side by side - whether they align and where they don't."""
     out.side_by_side(' ', 'File A', 'File B', force_display_even_if_same=True)
 
     num_var_diffs = {"left": 0, "right": 0, "both": 0}
-    with netCDF4.Dataset(nc_one) as nc_a, netCDF4.Dataset(nc_two) as nc_b:
-        out.side_by_side(
-            'All Variables', ' ', ' ', dash_line=False, force_display_even_if_same=True
-        )
-        out.side_by_side('-', '-', '-', dash_line=True, force_display_even_if_same=True)
+    out.side_by_side('All Variables', ' ', ' ', dash_line=False, force_display_even_if_same=True)
+    out.side_by_side('-', '-', '-', dash_line=True, force_display_even_if_same=True)
 
-        group_counter = 0
-        _print_group_details_side_by_side(
-            out, nc_a, "/", nc_b, "/", group_counter, num_var_diffs, show_attributes, show_chunks
-        )
-        group_counter += 1
-
-        for group_pairs in walk_common_groups_tree("", nc_a, "", nc_b):
-            for group_a_name, group_a, group_b_name, group_b in group_pairs:
-                _print_group_details_side_by_side(
-                    out,
-                    group_a,
-                    group_a_name,
-                    group_b,
-                    group_b_name,
-                    group_counter,
-                    num_var_diffs,
-                    show_attributes,
-                    show_chunks,
-                )
-                group_counter += 1
+    group_counter = 0
+    _print_group_details_side_by_side(
+        out, nc_a, "/", nc_b, "/", group_counter, num_var_diffs, show_attributes, show_chunks
+    )
+    out.flush()
+    _check_fast_fail(fast_fail, num_var_diffs['left'], num_var_diffs['right'], "Variables")
+    group_counter += 1
+
+    for group_pairs in walk_common_groups_tree("", nc_a, "", nc_b):
+        for group_a_name, group_a, group_b_name, group_b in group_pairs:
+            _print_group_details_side_by_side(
+                out,
+                group_a,
+                group_a_name,
+                group_b,
+                group_b_name,
+                group_counter,
+                num_var_diffs,
+                show_attributes,
+                show_chunks,
+            )
+            out.flush()
+            _check_fast_fail(
+                fast_fail,
+                int(group_b is None),
+                int(group_a is None),
+                f"Groups <{group_a_name or group_b_name}>",
+            )
+            _check_fast_fail(fast_fail, num_var_diffs['left'], num_var_diffs['right'], "Variables")
+            group_counter += 1
 
     out.side_by_side('-', '-', '-', dash_line=True, force_display_even_if_same=True)
     out.side_by_side(
@@ -381,34 +462,34 @@ def _print_group_details_side_by_side(
     )
 
     # Count the number of variables in this group as long as this group exists.
-    vars_a_sorted: Union[list, str] = ""
-    vars_b_sorted: Union[list, str] = ""
+    vars_a: Collection = ()
+    vars_b: Collection = ()
     if group_a:
-        vars_a_sorted = sorted(group_a.variables)
+        vars_a = group_a.variables.keys()
     if group_b:
-        vars_b_sorted = sorted(group_b.variables)
+        vars_b = group_b.variables.keys()
     out.side_by_side(
         'num variables in group:',
-        len(vars_a_sorted),
-        len(vars_b_sorted),
+        len(vars_a),
+        len(vars_b),
         highlight_diff=True,
         force_display_even_if_same=True,
     )
     out.side_by_side('-', '-', '-', dash_line=True, force_display_even_if_same=True)
 
     # Count differences between the lists of variables in this group.
-    left, right, both = count_diffs(vars_a_sorted, vars_b_sorted)
+    left, right, both = count_diffs(vars_a, vars_b)
     num_var_diffs['left'] += left
     num_var_diffs['right'] += right
     num_var_diffs['both'] += both
 
     # Go through each variable in the current group.
-    for variable_pair in common_elements(vars_a_sorted, vars_b_sorted):
+    for variable_pair in common_elements(vars_a, vars_b):
         # Get and print the properties of each variable
         _print_var_properties_side_by_side(
             out,
-            _var_properties(group_a, variable_pair[1]),
-            _var_properties(group_b, variable_pair[2]),
+            _var_properties(group_a, variable_pair[1], show_chunks, show_attributes),
+            _var_properties(group_b, variable_pair[2], show_chunks, show_attributes),
             show_chunks=show_chunks,
             show_attributes=show_attributes,
         )
@@ -421,6 +502,12 @@ def _print_var_properties_side_by_side(
     show_chunks: bool = False,
     show_attributes: bool = False,
 ):
+    # Attribute and scale factor strings are formatted only once, and reused for both checking and printing.
+    attribute_pairs = []
+    if show_attributes:
+        attribute_pairs = list(get_and_check_variable_attributes(v_a, v_b))
+    scale_factor_pair = get_and_check_variable_scale_factor(v_a, v_b)
+
     # Gather all variable property pairs first, before printing, so we can decide whether to highlight the variable header
     pairs_to_check_and_show = [
         (v_a.dtype, v_b.dtype),
@@ -428,12 +515,9 @@ def _print_var_properties_side_by_side(
     ]
     if show_chunks:
         pairs_to_check_and_show.append((v_a.chunking, v_b.chunking))
-    if show_attributes:
-        for attr_a_key, attr_a, attr_b_key, attr_b in get_and_check_variable_attributes(v_a, v_b):
-            # Check whether attr_a_key is empty, because it might be if the variable doesn't exist in File A.
-            pairs_to_check_and_show.append((attr_a, attr_b))
+    for _, attr_a, _, attr_b in attribute_pairs:
+        pairs_to_check_and_show.append((attr_a, attr_b))
     # Scale Factor
-    scale_factor_pair = get_and_check_variable_scale_factor(v_a, v_b)
     if scale_factor_pair:
         pairs_to_check_and_show.append((scale_factor_pair[0], scale_factor_pair[1]))
 
@@ -469,28 +553,21 @@ def _print_var_properties_side_by_side(
     if show_chunks:
         out.side_by_side("chunksize:", v_a.chunking, v_b.chunking, highlight_diff=True)
     # Attributes
-    if show_attributes:
-        for attr_a_key, attr_a, attr_b_key, attr_b in get_and_check_variable_attributes(v_a, v_b):
-            # Check whether attr_a_key is empty, because it might be if the variable doesn't exist in File A.
-            out.side_by_side(
-                f"{attr_a_key if attr_a_key else attr_b_key}:", attr_a, attr_b, highlight_diff=True
-            )
+    for attr_a_key, attr_a, attr_b_key, attr_b in attribute_pairs:
+        # Check whether attr_a_key is empty, because it might be if the variable doesn't exist in File A.
+        out.side_by_side(
+            f"{attr_a_key if attr_a_key else attr_b_key}:", attr_a, attr_b, highlight_diff=True
+        )
 
     # Scale Factor
-    scale_factor_pair = get_and_check_variable_scale_factor(v_a, v_b)
     if scale_factor_pair:
         out.side_by_side("sf:", scale_factor_pair[0], scale_factor_pair[1], highlight_diff=True)
 
 
 def get_and_check_variable_scale_factor(v_a, v_b) -> Union[None, tuple[str, str]]:
-    if getattr(v_a.variable, 'scale_factor', None):
-        sf_a = v_a.variable.scale_factor
-    else:
-        sf_a = ' '
-    if getattr(v_b.variable, 'scale_factor', None):
-        sf_b = v_b.variable.scale_factor
-    else:
-        sf_b = ' '
+    # The attribute is looked up only once per variable, because each lookup is a call into libnetcdf.
+    sf_a = getattr(v_a.variable, 'scale_factor', None) or ' '
+    sf_b = getattr(v_b.variable, 'scale_factor', None) or ' '
     if (sf_a != " ") or (sf_b != " "):
         return str(sf_a), str(sf_b)
     else:
@@ -512,13 +589,22 @@ def get_and_check_variable_attributes(v_a, v_b):
         yield attr_a_key, attr_a, attr_b_key, attr_b
 
 
-def _var_properties(group: Union[netCDF4.Dataset, netCDF4.Group], varname: str) -> VarProperties:
+def _var_properties(
+    group: Union[netCDF4.Dataset, netCDF4.Group],
+    varname: str,
+    get_chunking: bool = True,
+    get_attributes: bool = True,
+) -> VarProperties:
     """Get the properties of a variable.
 
     Parameters
     ----------
     group : `netCDF4.Dataset` or netCDF4.Group object
     varname : str
+    get_chunking : bool, default True
+        Whether to read the chunking; otherwise, an empty string is used
+    get_attributes : bool, default True
+        Whether to read all attributes; otherwise, None is used
 
     Returns
     -------
@@ -536,8 +622,12 @@ def _var_properties(group: Union[netCDF4.Dataset, netCDF4.Group], varname: str)
         the_variable = group.variables[varname]
         v_dtype = str(the_variable.dtype)
         v_shape = str(the_variable.shape).strip()
-        v_chunking = str(the_variable.chunking()).strip()
-        v_attributes = {name: getattr(the_variable, name) for name in the_variable.ncattrs()}
+        # Chunking and attributes each require additional calls into libnetcdf,
+        #   so they are only read when they will be shown.
+        v_chunking = str(the_variable.chunking()).strip() if get_chunking else ""
+        v_attributes = None
+        if get_attributes:
+            v_attributes = {name: getattr(the_variable, name) for name in the_variable.ncattrs()}
     else:
         the_variable = None
         v_dtype = ""
@@ -548,57 +638,274 @@ def _var_properties(group: Union[netCDF4.Dataset, netCDF4.Group], varname: str)
     return VarProperties(varname, the_variable, v_dtype, v_shape, v_chunking, v_attributes)
 
 
-def _match_random_value(
-    out: Outputter, nc_var_a: xr.Variable, nc_var_b: xr.Variable, thresh: float = 1e-6
-) -> Union[bool, None]:
-    """Check whether a randomly selected data point matches between two variables.
+def _match_random_values(
+    out: Outputter,
+    nc_var_a: netCDF4.Variable,
+    nc_var_b: netCDF4.Variable,
+    num_comparisons: int = 100,
+    thresh: float = 1e-6,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Check whether randomly selected data points match between two variables.
+
+    All random indices are generated up-front, and the comparison is evaluated for all samples at once.
+    One marker is printed per sample: "." for a match, "n" for a null mismatch, and "x" for a value mismatch,
+    with the details of each value mismatch printed just before its marker.
 
     Returns
     -------
-    None or bool
-        None if data point is null for one and only one of the variables
-        True if values match
-        False if the difference exceeds the given threshold
+    numpy.ndarray
+        boolean array, True where the difference exceeds the given threshold
+    numpy.ndarray
+        boolean array, True where the data point is null for one and only one of the variables
     """
-    # Get a random indexer
-    rand_index = []
-    for dim_length in nc_var_a.shape:
-        rand_index.append(random.randint(0, dim_length - 1))
-    rand_index_tuple = tuple(rand_index)
+    # Get an array of random indices, with one row per sample and one column per dimension
+    indices = np.empty((num_comparisons, nc_var_a.ndim), dtype=int)
+    for dim, dim_length in enumerate(nc_var_a.shape):
+        indices[:, dim] = _rng.integers(0, dim_length, size=num_comparisons)
 
     # Get the values from each variable
-    value_a = nc_var_a.values[rand_index_tuple]
-    value_b = nc_var_b.values[rand_index_tuple]
+    values_a = _read_values_at(nc_var_a, indices)
+    values_b = _read_values_at(nc_var_b, indices)
+
+    # Evaluate difference between values.
+    #   Integers are not converted to float, so that differences beyond float64 precision
+    #   (e.g., in int64 values above 2**53) are still detected.
+    data_a = np.ma.filled(values_a, 0)
+    data_b = np.ma.filled(values_b, 0)
+    if (data_a.dtype.kind in "iu") and (data_b.dtype.kind in "iu"):
+        data_a, data_b = _exact_integer_operands(data_a, data_b)
+    diff = np.subtract(data_b, data_a)
+
+    # Check whether null.
+    #   NaN propagates through the subtraction, so a single pass over the differences (and the masks) detects
+    #   any null values, and each variable's values only need to be checked separately when at least one is found.
+    either_is_null = np.ma.getmaskarray(values_a) | np.ma.getmaskarray(values_b)
+    if diff.dtype.kind == "f":
+        either_is_null |= np.isnan(diff)
+    if either_is_null.any():
+        only_one_is_null = np.logical_xor(_is_null(values_a), _is_null(values_b))
+    else:
+        only_one_is_null = either_is_null
+
+    # The threshold check writes into one boolean buffer, which is then updated in place to exclude nulls.
+    exceeded = np.greater(np.abs(diff), thresh)
+    np.logical_and(exceeded, ~either_is_null, out=exceeded)
+
+    markers = np.where(exceeded, "x", np.where(only_one_is_null, "n", "."))
+    start = 0
+    for i in np.flatnonzero(exceeded):
+        if i > start:
+            out.print("".join(markers[start:i]), colors=False, end="")
+        start = i
+        out.print()
+        out.print(Fore.RED + f"Difference exceeded threshold (diff == {diff[i]}")
+        out.print(f"var shape: {nc_var_a.shape}", colors=False)
+        out.print(f"indices:   {tuple(indices[i])}", colors=False)
+        out.print(f"value a: {values_a[i]}", colors=False)
+        out.print(f"value b: {values_b[i]}", colors=False, end="\n\n")
+    out.print("".join(markers[start:]), colors=False, end="")
+
+    return exceeded, only_one_is_null
+
+
+def _exact_integer_operands(
+    data_a: np.ndarray, data_b: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Get integer arrays whose difference can be computed exactly.
+
+    int64 is used whenever no difference can overflow it, so that NumPy's vectorized loops apply;
+    otherwise (e.g., for large uint64 values), the values are converted to Python integers.
+    """
+    limit = 2**62
+    if all(
+        np.can_cast(data.dtype, np.int64) and (data > -limit).all() and (data < limit).all()
+        for data in (data_a, data_b)
+    ):
+        return data_a.astype(np.int64), data_b.astype(np.int64)
+
+    return data_a.astype(object), data_b.astype(object)
+
+
+def _is_null(values: np.ma.MaskedArray) -> np.ndarray:
+    """Get a boolean array that is True where a value is masked or NaN."""
+    is_null = np.ma.getmaskarray(values)
+    if values.dtype.kind == "f":
+        is_null = is_null | np.isnan(np.ma.getdata(values))
+    return is_null
+
+
+def _read_values_at(nc_var: netCDF4.Variable, indices: np.ndarray) -> np.ma.MaskedArray:
+    """Read the data points at the given indices as a masked array.
+
+    The values keep the dtype that netCDF4 returns for the variable (i.e., they are not converted to float),
+    so that integer values are compared exactly.
+
+    Note
+    ----
+    netCDF4 applies orthogonal (not pointwise) indexing to integer arrays,
+    so each point is read as its own single-element hyperslab,
+    which avoids loading the whole variable into memory.
+    For chunked variables, the points are read grouped by chunk,
+    so that each chunk is decompressed only once and then served from the HDF5 chunk cache.
+    For contiguous, uncompressed variables, the points are instead read in one pass from a memory-map
+    of the file (when h5py is installed).
+    """
+    memmapped = _memmap_contiguous_variable(nc_var)
+    if memmapped is not None:
+        raw_values = np.asarray(memmapped[tuple(indices.T)])
+        return np.ma.masked_array(raw_values, mask=np.isin(raw_values, _fill_values(nc_var)))
+
+    chunking = nc_var.chunking()
+    if isinstance(chunking, list):
+        chunk_ids = indices // np.asarray(chunking)
+        # np.lexsort treats the last key as the primary one, so the dimensions are reversed.
+        read_order = np.lexsort(chunk_ids.T[::-1])
+    else:
+        read_order = np.arange(len(indices))
+
+    # Values are stored back at their original positions, so the sample order is preserved.
+    points: list = [None] * len(indices)
+    for i in read_order:
+        points[i] = nc_var[tuple(indices[i])]
+
+    # Masked points are read as the (float) np.ma.masked constant, so the dtype is taken from the others.
+    unmasked = [i for i, point in enumerate(points) if point is not np.ma.masked]
+    dtype = np.result_type(*(points[i].dtype for i in unmasked)) if unmasked else nc_var.dtype
+    values = np.ma.masked_all(len(indices), dtype=dtype)
+    for i in unmasked:
+        values[i] = points[i]
+
+    return values
+
 
-    # Check whether null
-    if np.isnan(value_a) and np.isnan(value_b):
-        return True
-    elif np.isnan(value_a) or np.isnan(value_b):
+def _memmap_contiguous_variable(nc_var: netCDF4.Variable) -> Optional[np.memmap]:
+    """Memory-map the data of a variable stored contiguously, and without compression, in an HDF5-based file.
+
+    Returns
+    -------
+    numpy.memmap or None
+        None if h5py is not installed or the variable's raw data cannot be used directly
+    """
+    if (
+        (h5py is None)
+        or (nc_var.ndim == 0)
+        or (not isinstance(nc_var.dtype, np.dtype))
+        or (nc_var.dtype.kind not in "iuf")
+        or (nc_var.dtype.itemsize == 1)
+        or (not nc_var.group().data_model.startswith("NETCDF4"))
+        or (nc_var.chunking() != "contiguous")
+        or any(attr in nc_var.ncattrs() for attr in _DECODING_ATTRIBUTES)
+    ):
         return None
 
-    # Evaluate difference between values
-    diff = value_b - value_a
-    if abs(diff) > thresh:
-        out.print()
-        out.print(Fore.RED + f"Difference exceeded threshold (diff == {diff}")
-        out.print(f"var shape: {nc_var_a.shape}", colors=False)
-        out.print(f"indices:   {rand_index_tuple}", colors=False)
-        out.print(f"value a: {value_a}", colors=False)
-        out.print(f"value b: {value_b}", colors=False, end="\n\n")
-        return False
+    filepath = nc_var.group().filepath()
+    try:
+        with h5py.File(filepath, "r") as h5_file:
+            h5_var = h5_file[nc_var.group().path][nc_var.name]
+            offset = h5_var.id.get_offset()
+            dtype = h5_var.dtype
+    except (OSError, KeyError):
+        return None
+    if offset is None:  # then storage for the variable was never allocated
+        return None
 
-    return True
+    return np.memmap(filepath, dtype=dtype, mode="r", offset=offset, shape=nc_var.shape)
 
 
-def _print_sample_values(out: Outputter, nc_filepath, groupname: str, varname: str) -> None:
-    comparison_variable = xr.open_dataset(nc_filepath, backend_kwargs={"group": groupname})[varname]
-    vector_of_values = comparison_variable.values.flatten()
-    n_values = len(vector_of_values)
-    if n_values > 100:
-        sample_length = 100
+def _fill_values(nc_var: netCDF4.Variable) -> list:
+    """Get the raw values that netCDF4 would mask for a (non single-byte) variable."""
+    if "_FillValue" in nc_var.ncattrs():
+        fill_values = [nc_var.getncattr("_FillValue")]
     else:
-        sample_length = n_values
-    out.print(str(vector_of_values[:sample_length]), colors=False)
+        fill_values = [netCDF4.default_fillvals[nc_var.dtype.str[1:]]]
+    if "missing_value" in nc_var.ncattrs():
+        fill_values.extend(np.atleast_1d(nc_var.getncattr("missing_value")))
+
+    return fill_values
+
+
+def _print_sample_values(
+    out: Outputter, dataset: netCDF4.Dataset, groupname: str, varname: str, num_values: int = 100
+) -> None:
+    comparison_variable = _get_group(dataset, groupname).variables[varname]
+
+    # Only the leading hyperslab that holds the first values (in C order) is read from the file.
+    values = comparison_variable[_leading_hyperslab(comparison_variable.shape, num_values)]
+    decoded_times = _decode_cf_times(comparison_variable, values)
+    if decoded_times is not None:
+        values = decoded_times
+    elif (values.dtype.kind in "iuf") and not {"_FillValue", "missing_value"}.isdisjoint(
+        comparison_variable.ncattrs()
+    ):
+        # Like xarray, values matching a _FillValue or missing_value attribute are shown as NaN,
+        #   with integer variables converted to float.
+        if values.dtype.kind in "iu":
+            values = values.astype(np.float64)
+        values = np.ma.filled(values, np.nan)
+    # Otherwise, the raw values are shown (e.g., default fill values, which netCDF4 masks but xarray does not).
+    vector_of_values = np.ma.getdata(values).flatten()
+
+    out.print(str(vector_of_values[:num_values]), colors=False)
+
+
+def _decode_cf_times(nc_var: netCDF4.Variable, values: np.ndarray) -> Optional[np.ndarray]:
+    """Decode values of a variable with CF time units (e.g., "days since 2000-01-01"), as xarray does.
+
+    Returns
+    -------
+    numpy.ndarray or None
+        datetime64 values for standard calendar dates that datetime64[ns] can represent,
+        otherwise cftime objects, or None if the variable does not have CF time units
+    """
+    units = getattr(nc_var, "units", None)
+    if not (isinstance(units, str) and (" since " in units) and (values.dtype.kind in "iuf")):
+        return None
+    calendar = getattr(nc_var, "calendar", "standard")
+
+    try:
+        dates = _dates_as_objects(
+            netCDF4.num2date(values, units, calendar=calendar, only_use_cftime_datetimes=False)
+        )
+    except ValueError:  # then the units or calendar could not be interpreted
+        return None
+
+    # num2date only returns real datetimes for standard calendars (e.g., not for 360_day or noleap).
+    if all(isinstance(date, datetime) for date in dates.flat if date is not None):
+        datetimes = dates.astype("datetime64[us]")
+        # Like xarray, dates are only shown with nanosecond precision if they fit into that range.
+        valid = datetimes[~np.isnat(datetimes)]
+        if not (
+            (valid < np.datetime64("1677-09-22")) | (valid > np.datetime64("2262-04-11"))
+        ).any():
+            return datetimes.astype("datetime64[ns]")
+        dates = _dates_as_objects(
+            netCDF4.num2date(values, units, calendar=calendar, only_use_cftime_datetimes=True)
+        )
+
+    return dates
+
+
+def _dates_as_objects(dates: Union[datetime, np.ndarray]) -> np.ndarray:
+    """Convert the (possibly masked) result of num2date to an object array, with None for missing values."""
+    date_objects = np.ma.getdata(dates).astype(object)
+    date_objects[np.ma.getmaskarray(dates)] = None
+    return date_objects
+
+
+def _leading_hyperslab(shape: tuple[int, ...], num_values: int) -> tuple[slice, ...]:
+    """Get the smallest hyperslab that contains the first `num_values` items of an array, in C order."""
+    slices = []
+    for axis in range(len(shape)):
+        num_trailing = max(int(np.prod(shape[axis + 1 :])), 1)
+        if num_trailing >= num_values:
+            # All the values fit within the first index of this axis.
+            slices.append(slice(0, 1))
+        else:
+            slices.append(slice(0, math.ceil(num_values / num_trailing)))
+            slices.extend(slice(None) for _ in shape[axis + 1 :])
+            break
+
+    return tuple(slices)
 
 
 def _get_attribute_value_as_str(varprops: VarProperties, attribute_key: str) -> str:
@@ -616,34 +923,30 @@ def _get_attribute_value_as_str(varprops: VarProperties, attribute_key: str) ->
     return ""
 
 
-def _get_vars(nc_filepath: Union[str, Path], groupname: str) -> list:
-    try:
-        grp = xr.open_dataset(nc_filepath, backend_kwargs={"group": groupname})
-    except OSError as err:
-        print(f"\nError occurred when attempting to open group within <{nc_filepath}>.\n")
-        raise err
-    grp_varlist = sorted(list(grp.variables.keys()))  # type:ignore[type-var]
+def _get_group(dataset: netCDF4.Dataset, groupname: str) -> Union[netCDF4.Dataset, netCDF4.Group]:
+    """Get a (possibly nested) group, e.g., "Group2/Group2_subgroup", from an open netCDF4 dataset."""
+    group = dataset
+    for name in groupname.strip("/").split("/"):
+        if name:
+            group = group.groups[name]
+    return group
 
-    return grp_varlist
 
+def _get_vars(dataset: netCDF4.Dataset, groupname: str) -> list:
+    try:
+        grp = _get_group(dataset, groupname)
+    except KeyError as err:
+        print(f"\nError occurred when attempting to open group within <{dataset.filepath()}>.\n")
+        raise OSError(f"group not found: {groupname}") from err
+    grp_varlist = sorted(grp.variables.keys())
 
-def _get_groups(nc_filepath: Union[str, Path]) -> list:
-    with netCDF4.Dataset(nc_filepath) as dataset:
-        groups_list = list(dataset.groups.keys())
-    return groups_list
+    return grp_varlist
 
 
-def _get_dims(nc_filepath: Union[str, Path]) -> list:
-    def __get_dim_list(decode_times=True):
-        with xr.open_dataset(nc_filepath, decode_times=decode_times) as dataset:
-            return list(dataset.dims.items())
+def _get_groups(dataset: netCDF4.Dataset) -> list:
+    return list(dataset.groups.keys())
 
-    try:
-        dims_list = __get_dim_list()
-    except ValueError as err:
-        if "decode_times" in str(err):  # then try again without decoding the times
-            dims_list = __get_dim_list(decode_times=False)
-        else:
-            raise err from None  # "from None" prevents additional trace (see https://stackoverflow.com/a/18188660)
 
-    return dims_list
+def _get_dims(dataset: netCDF4.Dataset) -> list:
+    # Sorted by dimension name only, since the names are unique.
+    return sorted(((name, len(dim)) for name, dim in dataset.dimensions.items()), key=itemgetter(0))
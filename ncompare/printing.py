@@ -26,7 +26,9 @@
 
 """Utility functions for printing to the console or a text file."""
 import csv
+import io
 import re
+import sys
 import warnings
 from collections.abc import Iterable
 from pathlib import Path
@@ -58,6 +60,13 @@ ansi_escape = re.compile(
 )
 
 
+class _NoColor:
+    """Stand-in for colorama's `Fore` and `Style`, where every color and style is a blank string."""
+
+    def __getattr__(self, name: str) -> str:
+        return ""
+
+
 class Outputter:
     """Handler for print statements and saving to text and/or csv files."""
 
@@ -70,12 +79,16 @@ class Outputter:
         no_color: bool = False,
         text_file: Optional[Union[str, Path]] = None,
         column_widths: Optional[tuple[Union[int, str], Union[int, str], Union[int, str]]] = None,
+        buffer_stdout: bool = False,
     ):
         """Set up the handling of printing and saving destinations.
 
         Parameters
         ----------
         keep_print_history
+        buffer_stdout : bool, default False
+            Whether to collect console output in memory until `flush()` is called (or the context exits),
+            so that it is written to stdout in bulk instead of line by line.
         """
         # Parse the print history option.
         self._keep_print_history = keep_print_history
@@ -102,15 +115,24 @@ class Outputter:
         else:
             self._column_widths = tuple(default_widths)
 
+        self._no_color = no_color
         if no_color:
-            # Replace colorized styles with blank strings.
-            for k, _ in Fore.__dict__.items():
-                Fore.__dict__[k] = ""
-            for k, _ in Style.__dict__.items():
-                Style.__dict__[k] = ""
+            # Replace colorized styles with blank strings, without modifying colorama's globals.
+            self._fore = _NoColor()
+            self._style = _NoColor()
         else:
+            self._fore = Fore
+            self._style = Style
             colorama.init(autoreset=True)
 
+        # Color prefixes used for every printed line are built once, instead of on each call.
+        self._normal_prefix = self._fore.WHITE + self._style.RESET_ALL
+        self._diff_color = self._fore.RED
+        self._diff_color_space = " " * len(self._diff_color)
+
+        # Optionally collect console output, to be written in bulk.
+        self._stdout_buffer: Optional[io.StringIO] = io.StringIO() if buffer_stdout else None
+
         # Open a file
         if text_file:
             filepath = Path(text_file)
@@ -127,6 +149,7 @@ class Outputter:
         return self
 
     def __exit__(self, exc_type, exc_value, exc_traceback):  # noqa: D105
+        self.flush()
         if self._text_file_obj:
             self._text_file_obj.close()
 
@@ -149,9 +172,17 @@ class Outputter:
             text_to_print = self._make_normal(string)
         else:
             text_to_print = string
+        if self._no_color:
+            # Remove any ANSI escape sequences that were included in the given string.
+            text_to_print = ansi_escape.sub('', text_to_print)
 
         # Execute the print command.
-        print(text_to_print, **print_args)
+        if self._stdout_buffer is not None:
+            # colorama's autoreset only applies once per write to stdout, and the buffer is written in bulk,
+            #   so each buffered line gets its own reset (which is blank when colors are turned off).
+            print(text_to_print + self._style.RESET_ALL, file=self._stdout_buffer, **print_args)
+        else:
+            print(text_to_print, **print_args)
 
         # Optional - write text to file
         if self._text_file_obj:
@@ -163,6 +194,14 @@ class Outputter:
         if add_to_history:
             self._add_to_history(text_to_print)
 
+    def flush(self) -> None:
+        """Write any buffered console output to stdout."""
+        if self._stdout_buffer is not None and self._stdout_buffer.tell():
+            sys.stdout.write(self._stdout_buffer.getvalue())
+            sys.stdout.flush()
+            self._stdout_buffer.seek(0)
+            self._stdout_buffer.truncate()
+
     def _add_to_history(self, *args):
         """Convert a list of items to a comma-separated string that is added to the csv history."""
 
@@ -194,10 +233,9 @@ class Outputter:
         if self._keep_print_history:
             self._line_history.append(parsed_strings)
 
-    @staticmethod
-    def _make_normal(string):
+    def _make_normal(self, string):
         """Return text with normal color and style."""
-        return Fore.WHITE + Style.RESET_ALL + str(string)
+        return self._normal_prefix + str(string)
 
     def side_by_side(
         self,
@@ -230,13 +268,12 @@ class Outputter:
         # If the 'b' and 'c' strings are different (or force_color is set),
         #   then change the font of 'a' to the color red.
         if (highlight_diff and are_different) or (force_color is not None):
-            default_color = Fore.RED
             if force_color is not None:
                 str_a = force_color + str_a
             else:
-                str_a = default_color + str_a
+                str_a = self._diff_color + str_a
             colors = False
-            extra_style_space = " " * len(default_color)
+            extra_style_space = self._diff_color_space
             str_marker = self._difference_marker
         else:
             colors = True
@@ -299,11 +336,11 @@ class Outputter:
 
         # Display the comparison result
         if contents_are_same:
-            msg = "\t" + Fore.CYAN + f"Are all items the same? ---> {str(contents_are_same)}."
+            msg = "\t" + self._fore.CYAN + f"Are all items the same? ---> {str(contents_are_same)}."
 
             if len(set_a) > 0:
                 self.print(msg, add_to_history=True)
-                self.print("\t" + Fore.CYAN + str(sorted(set_a)))
+                self.print("\t" + self._fore.CYAN + str(sorted(set_a)))
             else:
                 self.print(msg + "  (No items exist.)", add_to_history=True)
             return 0, 0, len(list_a)
@@ -311,13 +348,13 @@ class Outputter:
         # If contents are not the same, continue...
         left, right, both = count_diffs(list_a, list_b)
         self.print(
-            "\t" + "Are all items the same? ---> " + Fore.RED + f"{str(contents_are_same)}."
+            "\t" + "Are all items the same? ---> " + self._fore.RED + f"{str(contents_are_same)}."
             f"  ({_item_is_or_are(both)} shared, out of {len(s_union)} total.)",
             add_to_history=True,
         )
 
         # Which variables are different?
-        self.print("\t" + Fore.RED + "Which items are different?")
+        self.print("\t" + self._fore.RED + "Which items are different?")
         # print(Fore.RED + "Which items are different? ---> %s." %
         #       str(set(list_a).symmetric_difference(list_b)))
 
@@ -24,8 +24,10 @@
 # See the License for the specific language governing permissions and limitations under the License.
 
 """Helper functions for operating on iterables, such as lists or sets."""
+import heapq
 from collections.abc import Generator, Iterable
-from typing import Union
+from itertools import groupby
+from operator import itemgetter
 
 from ncompare.utils import coerce_to_str
 
@@ -48,30 +50,22 @@ def common_elements(
     str
         item from sequence_b, or an empty string
     """
-    a_sorted = sorted(map(coerce_to_str, sequence_a))
-    b_sorted = sorted(map(coerce_to_str, sequence_b))
-    all_items = sorted(set(a_sorted).union(set(b_sorted)))
+    # Each sequence is sorted and tagged with its origin, and the two are then merged lazily,
+    #   so that aligned pairs can be yielded (and printed) before the whole union is built.
+    tagged_a = ((item, "a") for item in sorted(map(coerce_to_str, sequence_a)))
+    tagged_b = ((item, "b") for item in sorted(map(coerce_to_str, sequence_b)))
+    merged = heapq.merge(tagged_a, tagged_b)
 
-    for i, item in enumerate(all_items):
-        item_a = item
-        item_b = item
-        if (item not in a_sorted) and (item not in b_sorted):
-            raise ValueError(
-                "Unexpected condition where an item was not found "
-                "but all items should exist in at least one list."
-            )
-
-        if item not in a_sorted:
-            item_a = ''
-        elif item not in b_sorted:
-            item_b = ''
+    # Consecutive equal items are grouped together, which also drops any duplicates.
+    for i, (item, group) in enumerate(groupby(merged, key=itemgetter(0))):
+        origins = {origin for _, origin in group}
+        item_a = item if "a" in origins else ''
+        item_b = item if "b" in origins else ''
 
         yield i, item_a, item_b
 
 
-def count_diffs(
-    list_a: Union[list[str], list[int], str], list_b: Union[list[str], list[int], str]
-) -> tuple[int, int, int]:
+def count_diffs(list_a: Iterable, list_b: Iterable) -> tuple[int, int, int]:
     """Count how many elements are either uniquely in one list or the other, or in both.
 
     Note
@@ -211,3 +211,119 @@ def ds_3dims_3vars_4coords_1subgroup(temp_data_dir):
     f.close()
 
     return filepath
+
+
+@pytest.fixture(scope="session")
+def ds_1dim_2vars_with_nulls(temp_data_dir):
+    filepath = temp_data_dir / "test_1dim_2vars_with_nulls.nc"
+
+    f = nC.Dataset(filename=filepath, mode="w")
+    f.createDimension('x', 4)
+
+    f.createVariable('data', 'f8', ('x',))
+    f['data'][:] = [1.0, 2.0, 3.0, 4.0]
+    #
+    f.createVariable('nulls', 'f8', ('x',))
+    f['nulls'][:] = [np.nan] * 4
+
+    f.close()
+
+    return filepath
+
+
+@pytest.fixture(scope="session")
+def ds_1dim_5vars_large_integers(temp_data_dir):
+    filepath = temp_data_dir / "test_1dim_5vars_large_integers.nc"
+
+    f = nC.Dataset(filename=filepath, mode="w")
+    f.createDimension('x', 1)
+
+    # Values whose differences cannot be represented exactly in float64 or int64
+    for varname, dtype, value in [
+        ('a', 'i8', 2**53),
+        ('b', 'i8', 2**53 + 1),
+        ('int64_min', 'i8', -(2**63) + 1),
+        ('int64_max', 'i8', 2**63 - 1),
+        ('uint64_max', 'u8', 2**64 - 3),
+    ]:
+        f.createVariable(varname, dtype, ('x',), fill_value=False)
+        f[varname][:] = [value]
+
+    f.close()
+
+    return filepath
+
+
+@pytest.fixture(scope="session")
+def ds_1dim_2vars_single_values(temp_data_dir):
+    filepath = temp_data_dir / "test_1dim_2vars_single_values.nc"
+
+    f = nC.Dataset(filename=filepath, mode="w")
+    f.createDimension('x', 1)
+
+    f.createVariable('a', 'f8', ('x',))
+    f['a'][:] = [0.0]
+    #
+    f.createVariable('b', 'f8', ('x',))
+    f['b'][:] = [1.0]
+
+    f.close()
+
+    return filepath
+
+
+@pytest.fixture(scope="session")
+def ds_2dims_1var_chunked(temp_data_dir):
+    filepath = temp_data_dir / "test_2dims_1var_chunked.nc"
+
+    f = nC.Dataset(filename=filepath, mode="w")
+    f.createDimension('y', 12)
+    f.createDimension('x', 10)
+
+    f.createVariable('v', 'f8', ('y', 'x'), chunksizes=(4, 5), zlib=True)
+    f['v'][:] = np.arange(12 * 10, dtype="f8").reshape(12, 10)
+
+    f.close()
+
+    return filepath
+
+
+@pytest.fixture(scope="session")
+def ds_2dims_1var_contiguous_1group(temp_data_dir):
+    filepath = temp_data_dir / "test_2dims_1var_contiguous_1group.nc"
+
+    f = nC.Dataset(filename=filepath, mode="w")
+    grp1 = f.createGroup('Group1')
+    grp1.createDimension('y', 6)
+    grp1.createDimension('x', 7)
+
+    # A contiguous variable, with the value 10 replaced by the fill value
+    grp1.createVariable('v', 'i4', ('y', 'x'), fill_value=-1)
+    data = np.arange(6 * 7, dtype="i4").reshape(6, 7)
+    grp1['v'][:] = np.where(data == 10, -1, data)
+
+    f.close()
+
+    return filepath
+
+
+@pytest.fixture(scope="session")
+def ds_1dim_2vars_cf_times(temp_data_dir):
+    filepath = temp_data_dir / "test_1dim_2vars_cf_times.nc"
+
+    f = nC.Dataset(filename=filepath, mode="w")
+    f.createDimension('time', 4)
+
+    # The last value is missing
+    f.createVariable('time', 'f8', ('time',), fill_value=-1.0)
+    f['time'].units = "days since 2000-01-01"
+    f['time'][:] = [0.0, 1.0, 2.0, -1.0]
+    #
+    f.createVariable('time_360_day', 'f8', ('time',))
+    f['time_360_day'].units = "days since 2000-01-01"
+    f['time_360_day'].calendar = "360_day"
+    f['time_360_day'][:] = [0.0, 1.0, 2.0, 3.0]
+
+    f.close()
+
+    return filepath
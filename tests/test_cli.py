@@ -46,3 +46,4 @@ def test_arg_parser():
     assert getattr(parsed, "show_attributes") is False
     assert getattr(parsed, "show_chunks") is False
     assert getattr(parsed, "only_diffs") is False
+    assert getattr(parsed, "fast_fail") is False
@@ -30,10 +30,21 @@ Note that full comparison tests are performed in both directions, i.e., A -> B a
 """
 from contextlib import nullcontext as does_not_raise
 
+import netCDF4
+import numpy as np
 import pytest
 import xarray as xr
 
-from ncompare.core import _get_vars, _match_random_value, _print_sample_values, compare
+from ncompare.core import (
+    StructureMismatch,
+    _get_vars,
+    _match_random_values,
+    _memmap_contiguous_variable,
+    _print_sample_values,
+    _read_values_at,
+    compare,
+)
+from ncompare.printing import Outputter
 
 
 def compare_ab(a, b):
@@ -68,46 +79,122 @@ def test_no_error_compare_2groupsTo1Subgroup(
     compare_ba(ds_3dims_3vars_4coords_2groups, ds_3dims_3vars_4coords_1subgroup)
 
 
+def test_fast_fail_raises_for_different_structure(
+    ds_3dims_3vars_4coords_1group, ds_3dims_3vars_4coords_2groups
+):
+    with pytest.raises(StructureMismatch):
+        compare(ds_3dims_3vars_4coords_1group, ds_3dims_3vars_4coords_2groups, fast_fail=True)
+
+
+def test_fast_fail_no_error_for_duplicate_dataset(ds_3dims_3vars_4coords_1subgroup):
+    with does_not_raise():
+        compare(ds_3dims_3vars_4coords_1subgroup, ds_3dims_3vars_4coords_1subgroup, fast_fail=True)
+
+
 def test_matching_random_values(
     ds_3dims_2vars_4coords,
     ds_4dims_3vars_5coords,
     ds_3dims_3vars_4coords_1group,
     outputter_to_console,
 ):
-    variable_array_1 = xr.open_dataset(ds_3dims_2vars_4coords).variables['z1']
-    variable_array_2 = xr.open_dataset(ds_4dims_3vars_5coords).variables['z1']
+    with netCDF4.Dataset(ds_3dims_2vars_4coords) as ds_1, netCDF4.Dataset(
+        ds_4dims_3vars_5coords
+    ) as ds_2:
+        variable_array_1 = ds_1.variables['z1']
+        variable_array_2 = ds_2.variables['z1']
 
-    assert (
-        _match_random_value(
+        exceeded, only_one_is_null = _match_random_values(
             outputter_to_console,
             variable_array_1,
             variable_array_1,
         )
-        is True
-    )
-    assert (
-        _match_random_value(
+        assert not exceeded.any()
+        assert not only_one_is_null.any()
+
+        exceeded, only_one_is_null = _match_random_values(
             outputter_to_console,
             variable_array_1,
             variable_array_2,
         )
-        is False
-    )
+        assert exceeded.all()
+        assert not only_one_is_null.any()
 
 
-def test_print_values_runs_with_no_error(ds_3dims_3vars_4coords_1group, outputter_to_console):
-    with does_not_raise():
-        _print_sample_values(
-            outputter_to_console, ds_3dims_3vars_4coords_1group, groupname="Group1", varname="step"
+def test_matching_random_values_with_nulls(ds_1dim_2vars_with_nulls, outputter_to_console):
+    with netCDF4.Dataset(ds_1dim_2vars_with_nulls) as ds:
+        exceeded, only_one_is_null = _match_random_values(
+            outputter_to_console, ds['data'], ds['nulls']
+        )
+        assert not exceeded.any()
+        assert only_one_is_null.all()
+
+        exceeded, only_one_is_null = _match_random_values(
+            outputter_to_console, ds['nulls'], ds['nulls']
         )
+        assert not exceeded.any()
+        assert not only_one_is_null.any()
+
+
+def test_matching_random_values_with_large_integers(
+    ds_1dim_5vars_large_integers, outputter_to_console
+):
+    with netCDF4.Dataset(ds_1dim_5vars_large_integers) as ds:
+        for varname_a, varname_b in [
+            ('a', 'b'),
+            ('int64_min', 'int64_max'),
+            ('int64_max', 'uint64_max'),
+        ]:
+            exceeded, only_one_is_null = _match_random_values(
+                outputter_to_console, ds[varname_a], ds[varname_b]
+            )
+            assert exceeded.all()
+            assert not only_one_is_null.any()
+
+
+def test_matching_random_values_prints_details_before_each_marker(
+    ds_1dim_2vars_single_values, capsys
+):
+    with netCDF4.Dataset(ds_1dim_2vars_single_values) as ds:
+        _match_random_values(Outputter(no_color=True), ds['a'], ds['b'], num_comparisons=2)
+
+    blocks = capsys.readouterr().out.split("Difference exceeded threshold")
+    assert len(blocks) == 3
+    assert blocks[1].endswith("value b: 1.0\n\nx\n")
+    assert blocks[2].endswith("value b: 1.0\n\nx")
+
+
+def test_read_values_at_chunked_variable_preserves_order(ds_2dims_1var_chunked):
+    indices = np.array([[11, 9], [0, 0], [5, 7], [0, 6], [11, 0], [4, 4]])
+    with netCDF4.Dataset(ds_2dims_1var_chunked) as ds:
+        values = _read_values_at(ds['v'], indices)
+        expected = ds['v'][:][tuple(indices.T)]
+
+    np.testing.assert_array_equal(values, expected)
+
+
+def test_read_values_at_contiguous_variable_via_memmap(ds_2dims_1var_contiguous_1group):
+    pytest.importorskip("h5py")
+
+    indices = np.array([[5, 6], [1, 3], [0, 0], [5, 6]])
+    with netCDF4.Dataset(ds_2dims_1var_contiguous_1group) as ds:
+        assert _memmap_contiguous_variable(ds['Group1']['v']) is not None
+        values = _read_values_at(ds['Group1']['v'], indices)
+
+    assert values.dtype == np.dtype("i4")
+    np.testing.assert_array_equal(values.mask, [False, True, False, False])
+    np.testing.assert_array_equal(values.compressed(), [41, 0, 41])
+
+
+def test_print_values_runs_with_no_error(ds_3dims_3vars_4coords_1group, outputter_to_console):
+    with does_not_raise(), netCDF4.Dataset(ds_3dims_3vars_4coords_1group) as ds:
+        _print_sample_values(outputter_to_console, ds, groupname="Group1", varname="step")
 
 
 def test_print_values_to_text_file_runs_with_no_error(
     ds_3dims_3vars_4coords_1group, outputter_to_text_file, temp_test_text_file_path
 ):
-    _print_sample_values(
-        outputter_to_text_file, ds_3dims_3vars_4coords_1group, groupname="Group1", varname="step"
-    )
+    with netCDF4.Dataset(ds_3dims_3vars_4coords_1group) as ds:
+        _print_sample_values(outputter_to_text_file, ds, groupname="Group1", varname="step")
     outputter_to_text_file._text_file_obj.close()
 
     comparison_variable = xr.open_dataset(
@@ -121,6 +208,24 @@ def test_print_values_to_text_file_runs_with_no_error(
         ]
 
 
+def test_print_values_decodes_cf_times(ds_1dim_2vars_cf_times, capsys):
+    with netCDF4.Dataset(ds_1dim_2vars_cf_times) as ds:
+        _print_sample_values(Outputter(no_color=True), ds, groupname="/", varname="time")
+        printed = capsys.readouterr().out.replace("[", "").replace("]", "").split()
+        assert printed == [
+            "'2000-01-01T00:00:00.000000000'",
+            "'2000-01-02T00:00:00.000000000'",
+            "'2000-01-03T00:00:00.000000000'",
+            "'NaT'",
+        ]
+
+        # Dates of non-standard calendars are shown as cftime objects, even if they are valid standard dates.
+        _print_sample_values(Outputter(no_color=True), ds, groupname="/", varname="time_360_day")
+        printed = capsys.readouterr().out
+        assert printed.count("cftime.Datetime360Day(") == 4
+        assert "datetime64" not in printed
+
+
 def test_comparison_group_no_error_for_duplicate_dataset(
     ds_3dims_3vars_4coords_1group, temp_test_text_file_path
 ):
@@ -166,11 +271,44 @@ def test_comparison_var_no_error_for_duplicate_dataset(
         assert False
 
 
+def test_comparison_var_missing_reports_error(
+    ds_3dims_3vars_4coords_1group, ds_3dims_3vars_4coords_2groups, temp_test_text_file_path
+):
+    compare(
+        ds_3dims_3vars_4coords_1group,
+        ds_3dims_3vars_4coords_2groups,
+        comparison_var_group="Group1",
+        comparison_var_name="nonexistent_var",
+        file_text=temp_test_text_file_path,
+    )
+
+    with open(temp_test_text_file_path) as f:
+        text = f.read()
+    assert "variable not found in File A and File B." in text
+    assert "Sample values within specified variable" not in text
+
+
+def test_comparison_group_missing_reports_error_after_header(ds_3dims_2vars_4coords, capsys):
+    with pytest.raises(OSError):
+        compare(
+            ds_3dims_2vars_4coords,
+            ds_3dims_2vars_4coords,
+            comparison_var_group="nonexistent",
+            no_color=True,
+        )
+
+    printed = capsys.readouterr().out
+    assert printed.index("Variables within specified group <nonexistent>") < printed.index(
+        "Error occurred when attempting to open group"
+    )
+
+
 def test_get_vars_with_group(ds_3dims_3vars_4coords_1group):
-    result = _get_vars(ds_3dims_3vars_4coords_1group, groupname="Group1")
+    with netCDF4.Dataset(ds_3dims_3vars_4coords_1group) as ds:
+        result = _get_vars(ds, groupname="Group1")
     assert set(result) == {'step', 'var1', 'var2', 'w'}
 
 
 def test_get_vars_error_when_no_group(ds_3dims_2vars_4coords):
-    with pytest.raises(OSError):
-        _get_vars(ds_3dims_2vars_4coords, groupname="nonexistent_group")
+    with pytest.raises(OSError), netCDF4.Dataset(ds_3dims_2vars_4coords) as ds:
+        _get_vars(ds, groupname="nonexistent_group")
@@ -23,6 +23,10 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and limitations under the License.
 
+from colorama import Fore, Style
+
+from ncompare.printing import Outputter
+
 
 def test_list_of_strings_diff(outputter_to_console):
     left, right, both = outputter_to_console.lists_diff(
@@ -30,3 +34,36 @@ def test_list_of_strings_diff(outputter_to_console):
     )
 
     assert (left, right, both) == (2, 3, 1)
+
+
+def test_no_color_does_not_modify_colorama_globals(capsys):
+    red = Fore.RED
+    out = Outputter(no_color=True)
+    out.print(Fore.RED + "some text", colors=True)
+    out.side_by_side("a", "b", "c", highlight_diff=True)
+
+    assert Fore.RED == red
+    assert "\x1b" not in capsys.readouterr().out
+
+
+def test_buffered_stdout_is_written_on_flush(capsys):
+    with Outputter(buffer_stdout=True) as out:
+        out.print("first line")
+        assert capsys.readouterr().out == ""
+
+        out.flush()
+        assert "first line" in capsys.readouterr().out
+
+        out.print("second line")
+    assert "second line" in capsys.readouterr().out
+
+
+def test_buffered_stdout_resets_style_after_each_line():
+    out = Outputter(buffer_stdout=True, no_color=False)
+    out.print(Fore.RED + "a red line", colors=True)
+    out.side_by_side("a", "b", "c", highlight_diff=True)
+    out.side_by_side("d", "e", "e", highlight_diff=True)
+
+    buffered_lines = out._stdout_buffer.getvalue().splitlines()
+    assert len(buffered_lines) == 3
+    assert all(line.endswith(Style.RESET_ALL) for line in buffered_lines)
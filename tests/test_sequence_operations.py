@@ -51,6 +51,12 @@ def test_common_elements(two_example_lists):
     assert composed_pairs == should_be
 
 
+def test_common_elements_ignores_duplicates():
+    composed_pairs = list(common_elements(['b', 'a', 'a'], ('b', 'c', 'b')))
+
+    assert composed_pairs == [(0, 'a', ''), (1, 'b', 'b'), (2, '', 'c')]
+
+
 def test_count_str_list_diffs(two_example_lists):
     left, right, both = count_diffs(*two_example_lists)
 